@@ -1,7 +1,13 @@
-from flask import render_template
+from flask import current_app
 from markupsafe import Markup
 
-from govuk_frontend_wtf.main import merger
+from govuk_frontend_wtf.main import merge_dicts
+
+# Widget kwargs which are mapped onto params rather than passed through as attributes
+MAPPED_KWARGS = frozenset(["id", "value", "type", "items", "params"])
+
+# Attribute on the Jinja environment holding its compiled widget templates, keyed on template name
+TEMPLATE_CACHE_ATTRIBUTE = "govuk_frontend_wtf_templates"
 
 
 class GovFormBase(object):
@@ -23,6 +29,12 @@ class GovFormBase(object):
         Taking WTForms' output, we need to map it to a params dict
         which matches the structure that the govuk macros are expecting
         """
+        # Any kwargs which aren't mapped directly below are treated as attributes
+        # This catches anything set in the more traditional WTForms manner
+        # i.e. directly as kwargs passed into the field when it's rendered
+        # Attributes such as required="True" are mapped to required="required" as we go
+        attributes = {key: key if value is True else value for key, value in kwargs.items() if key not in MAPPED_KWARGS}
+
         params = {
             "id": kwargs["id"],
             "name": field.name,
@@ -33,46 +45,60 @@ class GovFormBase(object):
 
         if "value" in kwargs:
             params["value"] = kwargs["value"]
-            del kwargs["value"]
 
         # Not all form elements have a type so guard against it not existing
         if "type" in kwargs:
             params["type"] = kwargs["type"]
-            del kwargs["type"]
-
-        # Remove items that we've already used from the kwargs
-        del kwargs["id"]
-        if "items" in kwargs:
-            del kwargs["items"]
 
         # Merge in any extra params passed in from the template layer
         if "params" in kwargs:
             params = self.merge_params(params, kwargs["params"])
 
-            # And then remove it, to make sure it doesn't make it's way into the attributes below
-            del kwargs["params"]
-
         # Map error messages
-        if field.errors:
-            params["errorMessage"] = {"text": field.errors[0]}
-
-        # And then Merge any remaining attributes directly to the attributes param
-        # This catches anything set in the more traditional WTForms manner
-        # i.e. directly as kwargs passed into the field when it's rendered
-        params["attributes"] = self.merge_params(params["attributes"], kwargs)
-
-        # Map attributes such as required="True" to required="required"
-        for key, value in params["attributes"].items():
-            if value is True:
-                params["attributes"][key] = key
+        errors = field.errors
+        if errors:
+            params["errorMessage"] = {"text": errors[0]}
+
+        # Attributes passed as kwargs take precedence over any from the template layer
+        if params["attributes"]:
+            template_attributes = params["attributes"]
+            params["attributes"] = {key: key if value is True else value for key, value in template_attributes.items()}
+            params["attributes"].update(attributes)
+        else:
+            params["attributes"] = attributes
 
         return params
 
     def merge_params(self, a, b):
-        return merger.merge(a, b)
+        return merge_dicts(a, b)
+
+    def get_template(self):
+        """Fetch the compiled template for this widget
+
+        Templates are cached on the app's Jinja environment so that pages
+        with many fields don't pay for a template lookup on every widget.
+        Keeping the cache on the environment means it is freed along with
+        the app. The cache is bypassed when the app has template auto
+        reloading switched on.
+        """
+        jinja_env = current_app.jinja_env
+        if jinja_env.auto_reload:
+            return jinja_env.get_template(self.template)
+
+        templates = getattr(jinja_env, TEMPLATE_CACHE_ATTRIBUTE, None)
+        if templates is None:
+            templates = {}
+            setattr(jinja_env, TEMPLATE_CACHE_ATTRIBUTE, templates)
+
+        template = templates.get(self.template)
+        if template is None:
+            template = templates[self.template] = jinja_env.get_template(self.template)
+        return template
 
     def render(self, params):
-        return Markup(render_template(self.template, params=params))
+        # Widget templates only need their params, so render them directly
+        # rather than running the app's context processors for every field
+        return Markup(self.get_template().render(params=params))
 
 
 class GovIterableBase(GovFormBase):
@@ -82,7 +108,8 @@ class GovIterableBase(GovFormBase):
         if "required" not in kwargs and "required" in getattr(field, "flags", []):
             kwargs["required"] = True
 
-        kwargs["items"] = []
+        items = kwargs["items"] = []
+        append_item = items.append
 
         # This field is constructed as an iterable of subfields
         for subfield in field:
@@ -91,7 +118,7 @@ class GovIterableBase(GovFormBase):
             if getattr(subfield, "checked", subfield.data):
                 item["checked"] = True
 
-            kwargs["items"].append(item)
+            append_item(item)
 
         return super().__call__(field, **kwargs)
 
@@ -110,17 +137,21 @@ class GovIterableBase(GovFormBase):
         }
 
         # Merge in any extra params passed in from the template layer
-        if "params" in kwargs:
+        # Most fields don't have any, in which case there's nothing to merge
+        extra_params = kwargs.get("params")
+        if extra_params:
             # Merge items individually as otherwise the merge will append new ones
-            if "items" in kwargs["params"]:
-                for index, item in enumerate(kwargs["params"]["items"]):
-                    item = self.merge_params(params["items"][index], item)
+            if "items" in extra_params:
+                for index, item in enumerate(extra_params["items"]):
+                    self.merge_params(params["items"][index], item)
 
-                del kwargs["params"]["items"]
+                # Copy rather than delete so the caller's params are left intact
+                extra_params = {key: value for key, value in extra_params.items() if key != "items"}
 
-            params = self.merge_params(params, kwargs["params"])
+            params = self.merge_params(params, extra_params)
 
-        if field.errors:
-            params["errorMessage"] = {"text": field.errors[0]}
+        errors = field.errors
+        if errors:
+            params["errorMessage"] = {"text": errors[0]}
 
         return params
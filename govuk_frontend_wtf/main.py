@@ -1,6 +1,3 @@
-from deepmerge import Merger
-
-
 class WTFormsHelpers(object):
     """WTForms helpers
 
@@ -17,48 +14,72 @@ class WTFormsHelpers(object):
         app.add_template_global(wtforms_errors)
 
 
-def wtforms_errors(form, params={}):
+def wtforms_errors(form, params=None):
     wtforms_params = {"titleText": "There is a problem", "errorList": []}
 
+    flatten_errors(form.errors, id_map=build_id_map(form), out=wtforms_params["errorList"])
+
+    if not params:
+        return wtforms_params
+
+    return merge_dicts(wtforms_params, params)
+
+
+def build_id_map(form):
+    """Return a mapping of field names to field ids for a form."""
     id_map = {}
-    for field_name in form._fields.keys():
-        field = getattr(form, field_name, None)
-        if field and hasattr(field, "id"):
+    for field_name, field in form._fields.items():
+        # Empty FieldLists are falsy, so check against None explicitly
+        if field is not None and hasattr(field, "id"):
             id_map[field_name] = field.id
+    return id_map
 
-    wtforms_params["errorList"] = flatten_errors(form.errors, id_map=id_map)
-
-    return merger.merge(wtforms_params, params)
-
-
-def flatten_errors(errors, prefix="", id_map={}):
-    """Return list of errors from form errors."""
-    error_list = []
-    if isinstance(errors, dict):
-        for key, value in errors.items():
-            # Recurse to handle subforms.
-            if key in id_map:
-                key = id_map[key]
-            error_list += flatten_errors(value, prefix=f"{prefix}{key}-", id_map=id_map)
-    elif isinstance(errors, list) and isinstance(errors[0], dict):
-        for idx, error in enumerate(errors):
-            error_list += flatten_errors(error, prefix=f"{prefix}{idx}-", id_map=id_map)
-    elif isinstance(errors, list):
-        error_list.append({"text": errors[0], "href": "#{}".format(prefix.rstrip("-"))})
-    else:
-        error_list.append({"text": errors, "href": "#{}".format(prefix.rstrip("-"))})
+
+def flatten_errors(errors, prefix="", id_map=None, out=None):
+    """Return list of errors from form errors.
+
+    If out is given the errors are appended to it rather than a new list.
+    """
+    if id_map is None:
+        id_map = {}
+    error_list = [] if out is None else out
+
+    # Walk the errors depth first, carrying the href as a tuple of id segments
+    # which is only joined (after the prefix, as given) once a leaf is reached
+    stack = [(errors, ())]
+    while stack:
+        errors, segments = stack.pop()
+        if isinstance(errors, dict):
+            # Subforms - push in reverse so they come off the stack in order
+            # Form level errors are keyed on None, so segments are always converted to strings
+            for key, value in reversed(list(errors.items())):
+                stack.append((value, segments + (str(id_map.get(key, key)),)))
+        elif isinstance(errors, list) and isinstance(errors[0], dict):
+            for idx in range(len(errors) - 1, -1, -1):
+                stack.append((errors[idx], segments + (str(idx),)))
+        elif isinstance(errors, list):
+            error_list.append({"text": errors[0], "href": "#" + (prefix + "-".join(segments)).rstrip("-")})
+        else:
+            error_list.append({"text": errors, "href": "#" + (prefix + "-".join(segments)).rstrip("-")})
     return error_list
 
 
-merger = Merger(
-    # pass in a list of tuple, with the
-    # strategies you are looking to apply
-    # to each type.
-    [(list, ["append"]), (dict, ["merge"])],
-    # next, choose the fallback strategies,
-    # applied to all other types:
-    ["override"],
-    # finally, choose the strategies in
-    # the case where the types conflict:
-    ["override"],
-)
+def merge_dicts(a, b):
+    """Deep merge dict b into dict a, in place
+
+    Nested dicts are merged recursively, lists are appended to and
+    any other value in b overrides the one in a. Unlike deepmerge's
+    append strategy (base + nxt), lists in a are extended in place
+    rather than replaced with a new list.
+    """
+    for key, value in b.items():
+        if key in a:
+            existing = a[key]
+            if isinstance(existing, dict) and isinstance(value, dict):
+                merge_dicts(existing, value)
+                continue
+            if isinstance(existing, list) and isinstance(value, list):
+                existing.extend(value)
+                continue
+        a[key] = value
+    return a
@@ -39,7 +39,6 @@ setuptools.setup(
     ],
     python_requires=">=3.9",
     install_requires=[
-        "deepmerge",
         "flask",
         "flask-wtf",
         "govuk-frontend-jinja>=3.0.0",
@@ -216,3 +216,10 @@ class ExampleForm(FlaskForm):
     def validate_string_field_id(self, field):
         if field.data != "John Smith":
             raise ValidationError('Example serverside error - type "John Smith" into this field to suppress it')
+
+    def validate(self, extra_validators=None):
+        result = super().validate(extra_validators=extra_validators)
+        if self.string_field.data == "Form error":
+            self.form_errors.append("Example form level error")
+            result = False
+        return result
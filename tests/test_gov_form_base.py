@@ -0,0 +1,53 @@
+import gc
+import unittest
+import weakref
+
+from flask import Flask
+from jinja2 import PackageLoader, PrefixLoader
+from wtforms import Form
+from wtforms.fields import StringField
+
+from govuk_frontend_wtf.wtforms_widgets import GovTextInput
+
+
+class TextForm(Form):
+    text = StringField("Text", widget=GovTextInput())
+
+
+def create_app():
+    app = Flask(__name__)
+    app.jinja_loader = PrefixLoader(
+        {
+            "govuk_frontend_jinja": PackageLoader("govuk_frontend_jinja"),
+            "govuk_frontend_wtf": PackageLoader("govuk_frontend_wtf"),
+        }
+    )
+    return app
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Test the caching of compiled widget templates"""
+
+    def test_template_is_reused(self):
+        app = create_app()
+        widget = GovTextInput()
+        with app.app_context():
+            self.assertIs(widget.get_template(), widget.get_template())
+
+    def test_template_is_per_app(self):
+        widget = GovTextInput()
+        with create_app().app_context():
+            first = widget.get_template()
+        with create_app().app_context():
+            second = widget.get_template()
+        self.assertIsNot(first.environment, second.environment)
+
+    def test_app_is_not_kept_alive(self):
+        app = create_app()
+        with app.app_context():
+            self.assertIn('id="text"', TextForm().text())
+
+        app_ref = weakref.ref(app)
+        del app
+        gc.collect()
+        self.assertIsNone(app_ref())
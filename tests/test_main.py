@@ -0,0 +1,51 @@
+import unittest
+
+from wtforms import Form
+from wtforms.fields import FieldList, FormField, StringField
+from wtforms.validators import InputRequired
+
+from govuk_frontend_wtf.main import build_id_map, wtforms_errors
+
+
+class ChildForm(Form):
+    name = StringField(validators=[InputRequired(message="Name is required")])
+
+
+class ParentForm(Form):
+    first = StringField(validators=[InputRequired(message="First is required")])
+    children = FieldList(FormField(ChildForm))
+
+
+class TestWtformsErrorsIdMap(unittest.TestCase):
+    """Test the field id mapping used to build error summary links"""
+
+    def hrefs(self, form):
+        form.validate()
+        return [error["href"] for error in wtforms_errors(form)["errorList"]]
+
+    def test_field_ids(self):
+        self.assertEqual(self.hrefs(ParentForm()), ["#first"])
+
+    def test_prefixed_form(self):
+        self.assertEqual(self.hrefs(ParentForm()), ["#first"])
+        self.assertEqual(self.hrefs(ParentForm(prefix="other")), ["#other-first"])
+        self.assertEqual(self.hrefs(ParentForm()), ["#first"])
+
+    def test_overridden_id_is_not_reused(self):
+        form = ParentForm()
+        form.first.id = "overridden-first"
+        self.assertEqual(self.hrefs(form), ["#overridden-first"])
+        self.assertEqual(self.hrefs(ParentForm()), ["#first"])
+
+    def test_nested_form_ids(self):
+        form = ParentForm(data={"children": [{"name": ""}]})
+        self.assertEqual(self.hrefs(form), ["#first", "#children-0-name"])
+
+    def test_empty_field_list_is_mapped(self):
+        form = ParentForm()
+        self.assertFalse(form.children)
+        self.assertEqual(build_id_map(form), {"first": "first", "children": "children"})
+        self.assertEqual(
+            build_id_map(ParentForm(prefix="other")),
+            {"first": "other-first", "children": "other-children"},
+        )
@@ -6,6 +6,11 @@ from flask import render_template_string
 from tests.app import app
 from tests.fixtures.wtf_widgets_example_form import ExampleForm
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class FlaskWtfMacroTestBase(unittest.TestCase):
     """Test the flask-wtf -> govuk widgets
@@ -59,7 +64,8 @@ def make_test_function(template, test_data):
     return test
 
 
-test_data = yaml.safe_load(open("tests/fixtures/wtf_widgets_data.yaml").read())
+with open("tests/fixtures/wtf_widgets_data.yaml") as f:
+    test_data = yaml.load(f, Loader=SafeLoader)
 
 for klassname, params in test_data.items():
     methods = {}